@@ -1,7 +1,7 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Generator, Iterable, NamedTuple
+from typing import Any, AsyncGenerator, Iterable, NamedTuple
 from PyQt5.QtCore import QObject, pyqtSignal
 
 from .api import WorkflowInput
@@ -267,7 +267,12 @@ class Client(ABC):
     async def enqueue(self, work: WorkflowInput, front: bool = False) -> str: ...
 
     @abstractmethod
-    async def listen(self) -> Generator[ClientMessage, Any, None]: ...
+    def listen(self) -> AsyncGenerator[ClientMessage, Any]: ...
+
+    async def listen_batches(self) -> AsyncGenerator[list[ClientMessage], Any]:
+        """Like `listen`, but yields all messages which are available at once as a list."""
+        async for msg in self.listen():
+            yield [msg]
 
     @abstractmethod
     async def interrupt(self): ...
@@ -304,6 +309,21 @@ class Client(ABC):
         await self.disconnect()
 
 
+def coalesce_progress(messages: list[ClientMessage]):
+    """Drops progress messages which are superseded by a later progress or finished message
+    for the same job. Used to collapse bursts of server messages."""
+    result: list[ClientMessage] = []
+    superseded: set[str] = set()
+    for msg in reversed(messages):
+        if msg.event is ClientEvent.progress and msg.job_id in superseded:
+            continue
+        if msg.event in (ClientEvent.progress, ClientEvent.finished):
+            superseded.add(msg.job_id)
+        result.append(msg)
+    result.reverse()
+    return result
+
+
 def resolve_arch(style: Style, client: Client | None = None):
     if style.architecture is Arch.auto:
         if client:
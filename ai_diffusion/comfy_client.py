@@ -12,7 +12,7 @@ from typing import Any, NamedTuple, Optional, Sequence
 from .api import WorkflowInput
 from .client import Client, CheckpointInfo, ClientMessage, ClientEvent, DeviceInfo, ClientModels
 from .client import SharedWorkflow, TranslationPackage, ClientFeatures, TextOutput
-from .client import filter_supported_styles, loras_to_upload
+from .client import coalesce_progress, filter_supported_styles, loras_to_upload
 from .files import FileFormat
 from .image import Image, ImageCollection
 from .network import RequestManager, NetworkError
@@ -87,6 +87,7 @@ class ComfyClient(Client):
     """HTTP/WebSocket client which sends requests to and listens to messages from a ComfyUI server."""
 
     default_url = "http://127.0.0.1:8188"
+    max_message_batch = 64
 
     def __init__(self, url):
         self.url = url
@@ -231,9 +232,16 @@ class ComfyClient(Client):
 
     async def _listen(self):
         url = websocket_url(self.url)
-        async for websocket in websockets_client.connect(
+        websocket_connect = websockets_client.connect(
             f"{url}/ws?clientId={self._id}", max_size=2**30, read_limit=2**30, ping_timeout=60
-        ):
+        )
+        # Reconnect quickly after short interruptions, and retry at least every 5 seconds
+        # (websockets default waits up to 5 seconds initially, and up to 60 seconds later)
+        websocket_connect.BACKOFF_INITIAL = 0.25
+        websocket_connect.BACKOFF_MIN = 0.5
+        websocket_connect.BACKOFF_FACTOR = 2.0
+        websocket_connect.BACKOFF_MAX = 5.0
+        async for websocket in websocket_connect:
             try:
                 await self._subscribe_workflows()
                 await self._listen_websocket(websocket)
@@ -335,13 +343,23 @@ class ComfyClient(Client):
                     await self._report(ClientEvent.published, "", result=workflow)
 
     async def listen(self):
+        async for messages in self.listen_batches():
+            for msg in messages:
+                yield msg
+
+    async def listen_batches(self):
         self._is_connected = True
         self._job_runner = asyncio.create_task(self._run())
         self._websocket_listener = asyncio.create_task(self._listen())
 
         try:
             while self._is_connected:
-                yield await self._messages.get()
+                # Drain all queued messages at once and skip outdated progress updates
+                messages = [await self._messages.get()]
+                while not self._messages.empty() and len(messages) < self.max_message_batch:
+                    messages.append(self._messages.get_nowait())
+                yield coalesce_progress(messages)
+                await asyncio.sleep(0)  # don't starve other tasks during message bursts
         except asyncio.CancelledError:
             pass
 
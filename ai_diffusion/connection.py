@@ -35,7 +35,7 @@ class Connection(QObject, ObservableProperties):
     state_changed = pyqtSignal(ConnectionState)
     error_changed = pyqtSignal(str)
     models_changed = pyqtSignal()
-    message_received = pyqtSignal(ClientMessage)
+    messages_received = pyqtSignal(list)  # list[ClientMessage], one emit per batch
     workflow_published = pyqtSignal(str)
 
     def __init__(self):
@@ -166,17 +166,30 @@ class Connection(QObject, ObservableProperties):
 
         try:
             async with client:
-                async for msg in client.listen():
-                    try:
-                        self._handle_message(msg)
-                    except asyncio.CancelledError:
-                        break
-                    except Exception as e:
-                        util.client_logger.exception(e)
-                        self.error = _("Error handling server message: ") + str(e)
+                async for messages in client.listen_batches():
+                    self._handle_message_batch(messages)
         except asyncio.CancelledError:
             pass  # shutdown
 
+    def _handle_message_batch(self, messages: list[ClientMessage]):
+        # Job messages are forwarded in one signal for each run between connection-level
+        # events, so they are still observed in the order they arrived.
+        job_messages: list[ClientMessage] = []
+        for msg in messages:
+            if msg.job_id:
+                job_messages.append(msg)
+                continue
+            if len(job_messages) > 0:
+                self.messages_received.emit(job_messages)
+                job_messages = []
+            try:  # a message which fails to be handled must not drop the rest of the batch
+                self._handle_message(msg)
+            except Exception as e:
+                util.client_logger.exception(e)
+                self.error = _("Error handling server message: ") + str(e)
+        if len(job_messages) > 0:
+            self.messages_received.emit(job_messages)
+
     def _handle_message(self, msg: ClientMessage):
         match msg:
             case (ClientEvent.error, "", *_):
@@ -192,8 +205,6 @@ class Connection(QObject, ObservableProperties):
                 assert isinstance(msg.result, SharedWorkflow)
                 self._workflows[msg.result.publisher] = msg.result.workflow
                 self.workflow_published.emit(msg.result.publisher)
-            case _:
-                self.message_received.emit(msg)
 
     def _update_state(self):
         if (
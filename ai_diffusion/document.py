@@ -115,7 +115,7 @@ class KritaDocument(Document):
         self._poller.setInterval(20)
         self._poller.timeout.connect(self._poll)
         self._poller.start()
-        self._instances[self._id.toString()] = self
+        self._instances[self.id] = self
         self._layers = LayerManager(krita_document)
 
     @classmethod
@@ -130,6 +130,10 @@ class KritaDocument(Document):
             return cls._instances.get(id) or KritaDocument(doc)
         return None
 
+    @property
+    def id(self):
+        return self._id.toString()
+
     @property
     def extent(self):
         return Extent(self._doc.width(), self._doc.height())
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from collections import deque
+from collections import Counter, deque
 from dataclasses import dataclass, fields, field
 from datetime import datetime
 from enum import Enum, Flag
@@ -97,11 +97,13 @@ class JobParams:
 
 
 class Job:
+    __slots__ = ("id", "kind", "state", "params", "control", "timestamp", "results", "_in_use")
+
     id: str | None
     kind: JobKind
-    state = JobState.queued
+    state: JobState
     params: JobParams
-    control: "control.ControlLayer | None" = None
+    control: "control.ControlLayer | None"
     timestamp: datetime
     results: ImageCollection
     _in_use: dict[int, bool]
@@ -109,7 +111,9 @@ class Job:
     def __init__(self, id: str | None, kind: JobKind, params: JobParams):
         self.id = id
         self.kind = kind
+        self.state = JobState.queued
         self.params = params
+        self.control = None
         self.timestamp = datetime.now()
         self.results = ImageCollection()
         self._in_use = {}
@@ -133,6 +137,8 @@ class JobQueue(QObject):
     result_discarded = pyqtSignal(Item)
 
     _entries: Deque[Job]
+    _by_id: dict[str, Job]
+    _state_counts: Counter[JobState]
     _selection: Item | None = None
     _previous_selection: Item | None = None
     _memory_usage = 0  # in MB
@@ -140,6 +146,8 @@ class JobQueue(QObject):
     def __init__(self):
         super().__init__()
         self._entries = deque()
+        self._by_id = {}
+        self._state_counts = Counter()
 
     def add(self, kind: JobKind, params: JobParams):
         return self.add_job(Job(None, kind, params))
@@ -151,20 +159,23 @@ class JobQueue(QObject):
 
     def add_job(self, job: Job):
         self._entries.append(job)
+        self._state_counts[job.state] += 1
+        if job.id:
+            self._by_id[job.id] = job
         self.count_changed.emit()
         return job
 
     def remove(self, job: Job):
         # Diffusion jobs: kept for history, pruned according to meomry usage
         # Control layer jobs: removed immediately once finished
-        self._entries.remove(job)
+        self._remove_entry(job)
         self.count_changed.emit()
 
     def find(self, id: str):
-        return next((j for j in self._entries if j.id == id), None)
+        return self._by_id.get(id)
 
     def count(self, state: JobState):
-        return sum(1 for j in self._entries if j.state is state)
+        return self._state_counts[state]
 
     def has_item(self, item: Item):
         job = self.find(item.job)
@@ -176,13 +187,17 @@ class JobQueue(QObject):
             self._memory_usage += results.size / (1024**2)
             self.prune(keep=job)
 
+    def notify_enqueued(self, job: Job, id: str):
+        job.id = id
+        self._by_id[id] = job
+
     def notify_started(self, job: Job):
         if job.state is not JobState.executing:
-            job.state = JobState.executing
+            self._set_state(job, JobState.executing)
             self.count_changed.emit()
 
     def notify_finished(self, job: Job):
-        job.state = JobState.finished
+        self._set_state(job, JobState.finished)
         self.job_finished.emit(job)
         self._cancel_earlier_jobs(job)
         self.count_changed.emit()
@@ -191,7 +206,7 @@ class JobQueue(QObject):
             self.remove(job)
 
     def notify_cancelled(self, job: Job):
-        job.state = JobState.cancelled
+        self._set_state(job, JobState.cancelled)
         self._cancel_earlier_jobs(job)
         self.count_changed.emit()
 
@@ -211,7 +226,7 @@ class JobQueue(QObject):
             self.selection = self._previous_selection
 
     def _discard_job(self, job: Job):
-        self._entries.remove(job)
+        self._remove_entry(job)
         self._memory_usage -= job.results.size / (1024**2)
         self.job_discarded.emit(job)
 
@@ -240,7 +255,12 @@ class JobQueue(QObject):
             self._discard_job(job)
 
     def any_executing(self):
-        return any(j.state is JobState.executing for j in self._entries)
+        return self._state_counts[JobState.executing] > 0
+
+    @property
+    def is_idle(self):
+        """True if there are no queued or executing jobs."""
+        return self._state_counts[JobState.queued] + self._state_counts[JobState.executing] == 0
 
     def __len__(self):
         return len(self._entries)
@@ -268,11 +288,24 @@ class JobQueue(QObject):
     def _cancel_earlier_jobs(self, job: Job):
         # Clear jobs that should have been completed before, but may not have completed
         # (still queued or executing state) due to sporadic server disconnect
+        if self.is_idle:
+            return  # nothing left to cancel, avoid iterating the whole history
         for j in self._entries:
             if j is job:
                 break
             if j.state in [JobState.queued, JobState.executing]:
-                j.state = JobState.cancelled
+                self._set_state(j, JobState.cancelled)
+
+    def _set_state(self, job: Job, state: JobState):
+        self._state_counts[job.state] -= 1
+        self._state_counts[state] += 1
+        job.state = state
+
+    def _remove_entry(self, job: Job):
+        self._entries.remove(job)
+        self._state_counts[job.state] -= 1
+        if job.id and self._by_id.get(job.id) is job:
+            del self._by_id[job.id]
 
 
 def _move_field(src: dict[str, Any], field: str, dest: dict[str, Any]):
@@ -7,7 +7,7 @@ from pathlib import Path
 from enum import Enum
 import time
 from typing import Any, NamedTuple
-from PyQt5.QtCore import QObject, QUuid, pyqtSignal, Qt
+from PyQt5.QtCore import QObject, QTimer, QUuid, pyqtSignal, Qt
 from PyQt5.QtGui import QPainter, QColor, QBrush
 import uuid
 
@@ -107,6 +107,11 @@ class Model(QObject, ObservableProperties):
         self._doc = document
         self._connection = connection
         self._layer: Layer | None = None
+        self._pending_progress: tuple[ProgressKind, float] | None = None
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(0)
+        self._progress_timer.timeout.connect(self._apply_progress)
         self.generate_seed()
         self.jobs = JobQueue()
         self.regions = RootRegion(self)
@@ -150,7 +155,6 @@ class Model(QObject, ObservableProperties):
         eventloop.run(_report_errors(self, jobs))
 
     def _prepare_workflow(self, dryrun=False):
-        workflow_kind = WorkflowKind.generate if self.strength == 1.0 else WorkflowKind.refine
         client = self._connection.client
         image = None
         inpaint_mode = InpaintMode.fill
@@ -183,12 +187,8 @@ class Model(QObject, ObservableProperties):
         if mask is not None or self.strength < 1.0:
             image = self._get_current_image(bounds) if not dryrun else DummyImage(bounds.extent)
 
+        workflow_kind = _workflow_kinds[(mask is not None, self.strength < 1.0)]
         if mask is not None:
-            if workflow_kind is WorkflowKind.generate:
-                workflow_kind = WorkflowKind.inpaint
-            elif workflow_kind is WorkflowKind.refine:
-                workflow_kind = WorkflowKind.refine_region
-
             bounds, mask.bounds = compute_relative_bounds(bounds, mask.bounds)
 
             if inpaint_mode is InpaintMode.custom:
@@ -238,15 +238,15 @@ class Model(QObject, ObservableProperties):
 
     async def _enqueue_job(self, job: Job, input: WorkflowInput):
         if not self.jobs.any_executing():
-            self.progress = 0.0
+            self._report_progress(0.0)
         client = self._connection.client
-        job.id = await client.enqueue(input, self.queue_front)
+        self.jobs.notify_enqueued(job, await client.enqueue(input, self.queue_front))
 
     def _prepare_upscale_image(self, dryrun=False):
         extent = self._doc.extent
-        image = self._doc.get_image(Bounds(0, 0, *extent)) if not dryrun else DummyImage(extent)
+        bounds = Bounds(0, 0, *extent)
+        image = self._doc.get_image(bounds) if not dryrun else DummyImage(extent)
         params = self.upscale.params
-        bounds = Bounds(0, 0, *self._doc.extent)
         client = self._connection.client
         upscaler = params.upscaler or client.models.default_upscaler
         if params.use_prompt and not dryrun:
@@ -322,9 +322,10 @@ class Model(QObject, ObservableProperties):
         client = self._connection.client
         min_mask_size = 512 if self.arch is Arch.sd15 else 800
         extent = self._doc.extent
+        bounds = Bounds(0, 0, *extent)
         region_layer = None
         job_regions: list[JobRegion] = []
-        inpaint = InpaintParams(InpaintMode.fill, Bounds(0, 0, *extent))
+        inpaint = InpaintParams(InpaintMode.fill, bounds)
 
         image = None
         selection_mod = get_selection_modifiers(inpaint.mode, strength, is_live=True)
@@ -333,7 +334,6 @@ class Model(QObject, ObservableProperties):
         )
         inpaint.grow, inpaint.feather = selection_mod.apply(selection_bounds)
 
-        bounds = Bounds(0, 0, *self._doc.extent)
         region_layer = self.regions.get_active_region_layer(use_parent=False)
         if mask is None and region_layer.bounds != bounds:
             mask = get_region_inpaint_mask(region_layer, extent, min_size=min_mask_size)
@@ -428,12 +428,13 @@ class Model(QObject, ObservableProperties):
             return
 
         try:
-            image = self._doc.get_image(Bounds(0, 0, *self._doc.extent))
+            image_bounds = Bounds(0, 0, *self._doc.extent)
+            image = self._doc.get_image(image_bounds)
             mask, _ = self.document.create_mask_from_selection(padding=0.25, multiple=64)
             bounds = mask.bounds if mask else None
             perf = self._connection.client.performance_settings
             input = workflow.prepare_create_control_image(image, control.mode, perf, bounds)
-            job = self.jobs.add_control(control, Bounds(0, 0, *image.extent))
+            job = self.jobs.add_control(control, image_bounds)
         except Exception as e:
             self.report_error(util.log_error(e))
             return
@@ -471,16 +472,13 @@ class Model(QObject, ObservableProperties):
 
         if message.event is ClientEvent.queued:
             self.jobs.notify_started(job)
-            self.progress = -1
-            self.progress_changed.emit(-1)
+            self._report_progress(-1)
         elif message.event is ClientEvent.progress:
             self.jobs.notify_started(job)
-            self.progress_kind = ProgressKind.generation
-            self.progress = message.progress
+            self._report_progress(message.progress, ProgressKind.generation)
         elif message.event is ClientEvent.upload:
             self.jobs.notify_started(job)
-            self.progress_kind = ProgressKind.upload
-            self.progress = message.progress
+            self._report_progress(message.progress, ProgressKind.upload)
         elif message.event is ClientEvent.output:
             self.custom.show_output(message.result)
         elif message.event is ClientEvent.finished:
@@ -511,10 +509,29 @@ class Model(QObject, ObservableProperties):
 
         if event is ClientEvent.finished:
             self.jobs.notify_finished(job)
-            self.progress = 1
+            self._report_progress(1)
         else:
             self.jobs.notify_cancelled(job)
-            self.progress = 0
+            self._report_progress(0)
+
+    def _report_progress(self, value: float, kind: ProgressKind | None = None):
+        # Progress can be reported many times per event loop iteration, only the latest
+        # value is applied (and signaled to the UI) once control returns to Qt.
+        if kind is None:
+            kind = self._pending_progress[0] if self._pending_progress else self.progress_kind
+        self._pending_progress = (kind, value)
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+
+    def _apply_progress(self):
+        if self._pending_progress is None:
+            return
+        kind, value = self._pending_progress
+        self._pending_progress = None
+        self.progress_kind = kind
+        if value == -1 and self.progress == -1:
+            self.progress_changed.emit(-1)  # queued: notify even if unchanged
+        self.progress = value
 
     def update_preview(self):
         if selection := self.jobs.selection:
@@ -915,6 +932,7 @@ class LiveWorkspace(QObject, ObservableProperties):
         self._keyframe_start = 0
         self._keyframe_index = 0
         self._keyframes: list[Path] = []
+        self._task: asyncio.Task | None = None
         model.jobs.job_finished.connect(self.handle_job_finished)
 
     def toggle(self, active: bool):
@@ -922,7 +940,7 @@ class LiveWorkspace(QObject, ObservableProperties):
             self._is_active = active
             self.is_active_changed.emit(active)
             if active:
-                eventloop.run(_report_errors(self._model, self._continue_generating()))
+                self._start_generating()
             else:
                 self.is_recording = False
 
@@ -945,7 +963,13 @@ class LiveWorkspace(QObject, ObservableProperties):
                 self.set_result(job.results[0], job.params)
             self.is_active = self._is_active and self._model.document.is_active
             self._scheduler.notify_generation_finished()
-            eventloop.run(_report_errors(self._model, self._continue_generating()))
+            self._start_generating()
+
+    def _start_generating(self):
+        # Don't start a second loop if the previous one is still polling for changes,
+        # eg. when live mode is quickly toggled off and on again.
+        if self._task is None or self._task.done():
+            self._task = eventloop.run(_report_errors(self._model, self._continue_generating()))
 
     async def _continue_generating(self):
         while self.is_active:
@@ -1051,6 +1075,7 @@ class AnimationWorkspace(QObject, ObservableProperties):
     _model: Model
     _keyframes_folder: Path | None = None
     _keyframes: dict[str, list[Path]]
+    _batch_task: asyncio.Task | None = None
 
     def __init__(self, model: Model):
         super().__init__()
@@ -1070,34 +1095,49 @@ class AnimationWorkspace(QObject, ObservableProperties):
         self._model.clear_error()
         eventloop.run(_report_errors(self._model, self._generate_frame()))
 
-    def _prepare_input(self, canvas: Image | Extent, seed: int, time: int):
+    def _input_factory(self, seed: int):
+        """Resolves settings once, so all frames of a batch are generated with the same."""
         m = self._model
+        client = m._connection.client
         bounds = Bounds(0, 0, *m.document.extent)
-        conditioning, _ = process_regions(m.regions, bounds, self._model.layers.root, time=time)
-        conditioning.language = m.prompt_translation_language
-        return workflow.prepare(
-            WorkflowKind.generate if m.strength == 1.0 else WorkflowKind.refine,
-            canvas,
-            conditioning,
-            style=m.style,
-            seed=seed,
-            perf=m._connection.client.performance_settings,
-            models=m._connection.client.models,
-            files=FileLibrary.instance(),
-            strength=m.strength,
-            is_live=self.sampling_quality is SamplingQuality.fast,
-        )
+        regions, root_layer = m.regions, m.layers.root
+        language = m.prompt_translation_language
+        style, strength = m.style, m.strength
+        kind = WorkflowKind.generate if strength == 1.0 else WorkflowKind.refine
+        perf, models, files = client.performance_settings, client.models, FileLibrary.instance()
+        is_live = self.sampling_quality is SamplingQuality.fast
+
+        def prepare_input(canvas: Image | Extent, time: int):
+            conditioning, _ = process_regions(regions, bounds, root_layer, time=time)
+            conditioning.language = language
+            return workflow.prepare(
+                kind,
+                canvas,
+                conditioning,
+                style=style,
+                seed=seed,
+                perf=perf,
+                models=models,
+                files=files,
+                strength=strength,
+                is_live=is_live,
+            )
+
+        return prepare_input
 
     async def _generate_frame(self):
         m = self._model
         bounds = Bounds(0, 0, *m.document.extent)
         canvas = m._get_current_image(bounds) if m.strength < 1.0 else bounds.extent
         seed = m.seed if m.fixed_seed else workflow.generate_seed()
-        inputs = self._prepare_input(canvas, seed, m.document.current_time)
+        inputs = self._input_factory(seed)(canvas, m.document.current_time)
         params = JobParams(bounds, m.regions.positive, frame=(m.document.current_time, 0, 0))
         await m.enqueue_jobs(inputs, JobKind.animation_frame, params)
 
     def generate_batch(self):
+        if self._batch_task is not None and not self._batch_task.done():
+            return  # previous batch is still being enqueued
+
         doc = self._model.document
         if self._model.strength < 1.0 and not self._model.layers.active.is_animated:
             self._model.report_error(_("The active layer does not contain an animation."))
@@ -1113,7 +1153,7 @@ class AnimationWorkspace(QObject, ObservableProperties):
             return
 
         self._model.clear_error()
-        eventloop.run(_report_errors(self._model, self._generate_batch()))
+        self._batch_task = eventloop.run(_report_errors(self._model, self._generate_batch()))
 
     async def _generate_batch(self):
         doc = self._model.document
@@ -1123,6 +1163,8 @@ class AnimationWorkspace(QObject, ObservableProperties):
         bounds = Bounds(0, 0, *extent)
         strength = self._model.strength
         seed = self._model.seed if self._model.fixed_seed else workflow.generate_seed()
+        prepare_input = self._input_factory(seed)
+        params_positive = self._model.regions.active_or_root.positive
         animation_id = str(uuid.uuid4())
 
         for frame in range(start_frame, end_frame + 1):
@@ -1131,11 +1173,17 @@ class AnimationWorkspace(QObject, ObservableProperties):
                 if strength < 1.0:
                     canvas = layer.get_pixels(time=frame)
 
-                inputs = self._prepare_input(canvas, seed, frame)
-                params = JobParams(bounds, self._model.regions.active_or_root.positive)
+                inputs = prepare_input(canvas, frame)
+                params = JobParams(bounds, params_positive)
                 params.frame = (frame, start_frame, end_frame)
                 params.animation_id = animation_id
                 await self._model.enqueue_jobs(inputs, JobKind.animation_batch, params)
+                # Reading frames from Krita must happen on the main thread. Return control to
+                # Qt between frames so the UI and server messages don't stall for long batches.
+                await asyncio.sleep(0)
+                if strength < 1.0 and layer.was_removed:
+                    self._model.report_error(_("Layer was removed during animation generation."))
+                    return
 
     def handle_job_finished(self, job: Job):
         if job.kind is JobKind.animation_batch:
@@ -1188,6 +1236,15 @@ class AnimationWorkspace(QObject, ObservableProperties):
             self.target_image_changed.emit(image)
 
 
+# (has mask, strength < 1) -> workflow
+_workflow_kinds = {
+    (False, False): WorkflowKind.generate,
+    (False, True): WorkflowKind.refine,
+    (True, False): WorkflowKind.inpaint,
+    (True, True): WorkflowKind.refine_region,
+}
+
+
 class SelectionModifiers(NamedTuple):
     grow: float
     feather: float
@@ -1,9 +1,10 @@
 from __future__ import annotations
 from typing import Callable, NamedTuple
+from krita import Krita
 from PyQt5.QtCore import QObject, pyqtSignal
 
 from .connection import Connection, ConnectionState
-from .client import ClientMessage
+from .client import ClientMessage, ClientEvent
 from .custom_workflow import WorkflowCollection
 from .server import Server, ServerState
 from .document import Document, KritaDocument
@@ -13,7 +14,7 @@ from .persistence import ModelSync, RecentlyUsedSync, import_prompt_from_file
 from .updates import AutoUpdate
 from .ui.theme import checkpoint_icon
 from .settings import ServerMode, settings
-from .util import client_logger as log
+from .util import log_error, client_logger as log
 
 
 class Root(QObject):
@@ -26,7 +27,9 @@ class Root(QObject):
 
     _server: Server
     _connection: Connection
-    _models: list[PerDocument]
+    _models: dict[str, PerDocument]  # document id -> model
+    _job_owners: dict[str, Model]
+    _active_cache: tuple[KritaDocument, Model] | None = None
     _recent: RecentlyUsedSync
 
     model_created = pyqtSignal(Model)
@@ -39,38 +42,46 @@ class Root(QObject):
         self._connection = Connection()
         self._files = FileLibrary.load()
         self._workflows = WorkflowCollection(self._connection)
-        self._models = []
+        self._models = {}
+        self._job_owners = {}
         self._null_model = Model(Document(), self._connection, self._workflows)
         self._recent = RecentlyUsedSync.from_settings()
         self._auto_update = AutoUpdate()
         if settings.auto_update:
             self._auto_update.check()
-        self._connection.message_received.connect(self._handle_message)
+        self._connection.messages_received.connect(self._handle_messages)
         self._connection.models_changed.connect(self._update_files)
+        notifier = Krita.instance().notifier()
+        notifier.imageClosed.connect(self._handle_image_closed)  # type: ignore
 
     def prune_models(self):
         # Remove models for documents that have been closed
-        self._models = [m for m in self._models if m.model.document.is_valid]
+        self._models = {k: m for k, m in self._models.items() if m.model.document.is_valid}
+        self._active_cache = None
+        models = {m.model for m in self._models.values()}
+        self._job_owners = {k: m for k, m in self._job_owners.items() if m in models}
 
     def create_model(self, doc: KritaDocument):
         model = Model(doc, self._connection, self._workflows)
         self._recent.track(model)
         persistence_sync = ModelSync(model)
         import_prompt_from_file(model)
-        self._models.append(Root.PerDocument(model, persistence_sync))
+        self._models[doc.id] = Root.PerDocument(model, persistence_sync)
         self.model_created.emit(model)
-        self.prune_models()
         return model
 
     def model_for_active_document(self) -> Model | None:
         doc = KritaDocument.active()
         if doc is None or not doc.is_valid:
             return None
-        model = next((m.model for m in self._models if m.model.document == doc), None)
-        if model is None:
-            model = self.create_model(doc)
-        else:
+        if self._active_cache is not None and self._active_cache[0] is doc:
+            return self._active_cache[1]
+        if per_document := self._models.get(doc.id):
+            model = per_document.model
             model.document = doc
+        else:
+            model = self.create_model(doc)
+        self._active_cache = (doc, model)
         return model
 
     @property
@@ -129,17 +140,35 @@ class Root(QObject):
         doc = KritaDocument.active()
         if doc is None or not doc.is_valid:
             return 0
-        if persist := next((m.sync for m in self._models if m.model.document == doc), None):
-            return persist.memory_used
+        if per_document := self._models.get(doc.id):
+            return per_document.sync.memory_used
         return 0
 
     def _find_model(self, job_id: str) -> Model | None:
-        return next((m.model for m in self._models if m.model.jobs.find(job_id)), None)
+        if model := self._job_owners.get(job_id):
+            return model
+        model = next((m.model for m in self._models.values() if m.model.jobs.find(job_id)), None)
+        if model is not None:
+            self._job_owners[job_id] = model
+        return model
+
+    def _handle_messages(self, messages: list[ClientMessage]):
+        for msg in messages:
+            self._handle_message(msg)
 
     def _handle_message(self, msg: ClientMessage):
         model = self._find_model(msg.job_id)
         if model is not None:
-            model.handle_message(msg)
+            try:
+                model.handle_message(msg)
+            except Exception as e:
+                # Report to the document which owns the job rather than all of them
+                model.report_error(log_error(e))
+            if msg.event in _job_end_events:
+                self._job_owners.pop(msg.job_id, None)
+
+    def _handle_image_closed(self, filename: str):
+        self.prune_models()
 
     def _update_files(self):
         if client := self._connection.client_if_connected:
@@ -159,4 +188,11 @@ class Root(QObject):
             self._files.loras.update(loras, FileSource.remote)
 
 
+_job_end_events = (
+    ClientEvent.finished,
+    ClientEvent.interrupted,
+    ClientEvent.error,
+    ClientEvent.payment_required,
+)
+
 root = Root()
@@ -8,7 +8,7 @@ from ai_diffusion.api import CheckpointInput, ImageInput, SamplingInput, Conditi
 from ai_diffusion.resources import ControlMode
 from ai_diffusion.network import NetworkError
 from ai_diffusion.image import Extent
-from ai_diffusion.client import ClientEvent, resolve_arch
+from ai_diffusion.client import ClientEvent, ClientMessage, coalesce_progress, resolve_arch
 from ai_diffusion.comfy_client import ComfyClient, parse_url, websocket_url
 from ai_diffusion.style import Arch, Style
 from ai_diffusion.server import Server, ServerState, ServerBackend
@@ -130,6 +130,25 @@ def test_parse_url(url, expected_http, expected_ws):
     assert parsed == expected_http and websocket_url(parsed) == expected_ws
 
 
+def test_coalesce_progress():
+    messages = [
+        ClientMessage(ClientEvent.progress, "a", 0.1),
+        ClientMessage(ClientEvent.progress, "b", 0.1),
+        ClientMessage(ClientEvent.progress, "a", 0.2),
+        ClientMessage(ClientEvent.output, "a"),
+        ClientMessage(ClientEvent.progress, "a", 0.3),
+        ClientMessage(ClientEvent.progress, "b", 0.5),
+        ClientMessage(ClientEvent.finished, "b", 1),
+        ClientMessage(ClientEvent.queued, "c"),
+    ]
+    assert coalesce_progress(messages) == [
+        ClientMessage(ClientEvent.output, "a"),
+        ClientMessage(ClientEvent.progress, "a", 0.3),
+        ClientMessage(ClientEvent.finished, "b", 1),
+        ClientMessage(ClientEvent.queued, "c"),
+    ]
+
+
 def check_client_info(client: ComfyClient):
     assert client.device_info.type in ["cpu", "cuda"]
     assert client.device_info.name != ""
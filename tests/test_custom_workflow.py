@@ -6,6 +6,7 @@ from PyQt5.QtCore import Qt
 
 from ai_diffusion.api import CustomWorkflowInput, ImageInput, WorkflowInput
 from ai_diffusion.client import Client, ClientModels, CheckpointInfo, TextOutput
+from ai_diffusion.client import ClientEvent, ClientMessage, SharedWorkflow
 from ai_diffusion.connection import Connection, ConnectionState
 from ai_diffusion.comfy_workflow import ComfyNode, ComfyWorkflow, Output
 from ai_diffusion.custom_workflow import CustomWorkflow, WorkflowSource, WorkflowCollection
@@ -55,6 +56,35 @@ def create_mock_connection(
     return connection
 
 
+def test_connection_message_batch():
+    connection = create_mock_connection({})
+    received = []
+
+    def on_messages_received(messages: list[ClientMessage]):
+        received.append(([m.job_id for m in messages], connection.error))
+
+    connection.messages_received.connect(on_messages_received)
+    graph = {"0": {"class_type": "P1", "inputs": {}}}
+    connection._handle_message_batch(
+        [
+            ClientMessage(ClientEvent.progress, "job1", 0.5),
+            ClientMessage(ClientEvent.finished, "job1", 1),
+            ClientMessage(ClientEvent.disconnected),
+            ClientMessage(ClientEvent.progress, "job2", 0.5),
+            ClientMessage(ClientEvent.published),  # no result, fails to be handled
+            ClientMessage(ClientEvent.published, result=SharedWorkflow("publisher1", graph)),
+            ClientMessage(ClientEvent.finished, "job2", 1),
+        ]
+    )
+    assert received == [
+        (["job1", "job1"], ""),
+        (["job2"], "Disconnected from server, trying to reconnect..."),
+        (["job2"], connection.error),
+    ]
+    assert str(connection.error).startswith("Error handling server message")
+    assert connection.workflows["publisher1"] == graph
+
+
 def _assert_has_workflow(
     collection: WorkflowCollection,
     name: str,
@@ -0,0 +1,70 @@
+from ai_diffusion.image import Bounds
+from ai_diffusion.jobs import Job, JobKind, JobParams, JobQueue, JobState
+
+
+def params(name="test"):
+    return JobParams(Bounds(0, 0, 8, 8), name)
+
+
+def test_find():
+    jobs = JobQueue()
+    job1 = jobs.add(JobKind.diffusion, params())
+    job2 = jobs.add_job(Job("job2", JobKind.diffusion, params()))
+    assert jobs.find("job1") is None
+    assert jobs.find("job2") is job2
+
+    jobs.notify_enqueued(job1, "job1")
+    assert job1.id == "job1"
+    assert jobs.find("job1") is job1
+
+    jobs.remove(job1)
+    assert jobs.find("job1") is None
+    assert jobs.find("job2") is job2
+    assert len(jobs) == 1
+
+
+def test_count():
+    jobs = JobQueue()
+    job1 = jobs.add_job(Job("job1", JobKind.diffusion, params()))
+    job2 = jobs.add_job(Job("job2", JobKind.diffusion, params()))
+    job3 = jobs.add_job(Job("job3", JobKind.control_layer, params()))
+    assert jobs.count(JobState.queued) == 3
+    assert not jobs.any_executing()
+
+    jobs.notify_started(job1)
+    jobs.notify_started(job1)
+    assert jobs.count(JobState.queued) == 2
+    assert jobs.count(JobState.executing) == 1
+    assert jobs.any_executing()
+
+    jobs.notify_finished(job2)  # job1 was not completed, gets cancelled
+    assert job1.state is JobState.cancelled
+    assert jobs.count(JobState.executing) == 0
+    assert jobs.count(JobState.cancelled) == 1
+    assert jobs.count(JobState.finished) == 1
+    assert jobs.count(JobState.queued) == 1
+
+    jobs.notify_finished(job3)  # control layer jobs are removed once finished
+    assert jobs.find("job3") is None
+    assert jobs.count(JobState.finished) == 1
+
+    jobs.clear()
+    assert jobs.count(JobState.finished) == 0
+    assert jobs.count(JobState.cancelled) == 1
+    assert [j.id for j in jobs] == ["job1"]
+
+
+def test_is_idle():
+    jobs = JobQueue()
+    assert jobs.is_idle
+
+    job1 = jobs.add_job(Job("job1", JobKind.diffusion, params()))
+    job2 = jobs.add_job(Job("job2", JobKind.diffusion, params()))
+    assert not jobs.is_idle
+
+    jobs.notify_started(job1)
+    jobs.notify_finished(job1)
+    assert not jobs.is_idle
+
+    jobs.remove(job2)
+    assert jobs.is_idle